@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from backend.core.database import get_db
+from backend.core.http_cache import cache_validators, is_not_modified, not_modified_response, cached_json
 from backend.models import DietLog, User
 from datetime import datetime, date, timedelta
 
 router = APIRouter()
 
 @router.get("/summary")
-async def get_daily_summary(user_id: int = 1, db: Session = Depends(get_db)):
+async def get_daily_summary(request: Request, user_id: int = 1, db: Session = Depends(get_db)):
     # Get start and end of today (UTC or Server Local Time - simplified to UTC date for MVP)
     today = datetime.utcnow().date()
+    validators = cache_validators("summary", user_id, today)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
     start_of_day = datetime.combine(today, datetime.min.time())
     end_of_day = datetime.combine(today, datetime.max.time())
 
@@ -22,12 +26,12 @@ async def get_daily_summary(user_id: int = 1, db: Session = Depends(get_db)):
         .filter(DietLog.timestamp <= end_of_day)\
         .scalar() or 0
 
-    return {
+    return cached_json({
         "date": str(today),
         "total_calories": total_calories,
         "goal_calories": 2000, # Hardcoded for now or fetch from User model
         "percentage": min(int((total_calories / 2000) * 100), 100)
-    }
+    }, validators)
 @router.post("/evaluate-plan")
 async def post_plan_evaluation(data: dict, db: Session = Depends(get_db)):
     user_id = data.get("user_id", 1)
@@ -58,8 +62,13 @@ async def post_plan_evaluation(data: dict, db: Session = Depends(get_db)):
         return {"error": str(e)}
 
 @router.get("/daily-recommendations")
-async def get_daily_recommendations_endpoint(user_id: int = 1, db: Session = Depends(get_db)):
+async def get_daily_recommendations_endpoint(request: Request, user_id: int = 1, db: Session = Depends(get_db)):
     from backend.models import DietLog, ExerciseLog, RecommendationCache
+
+    # 0. Nothing confirmed since the client's copy: skip the log and cache queries entirely
+    validators = cache_validators("recommendations", user_id, datetime.utcnow().date())
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
     
     # 1. Get latest log timestamps
     latest_diet = db.query(func.max(DietLog.timestamp)).filter(DietLog.user_id == user_id).scalar()
@@ -79,11 +88,11 @@ async def get_daily_recommendations_endpoint(user_id: int = 1, db: Session = Dep
         
         if is_diet_valid and is_ex_valid:
             print("[DEBUG] Returning cached recommendations")
-            return {
+            return cached_json({
                 "meal": cache.meal_recommendation,
                 "workout": cache.workout_recommendation,
                 "cached": True
-            }
+            }, validators)
         else:
             print("[DEBUG] Cache expired. Generating new ones...")
 
@@ -126,9 +135,9 @@ async def get_daily_recommendations_endpoint(user_id: int = 1, db: Session = Dep
     db.commit()
     print(f"[DEBUG] Recommendation updated at {cache.generated_at}")
     
-    return {
+    return cached_json({
         "meal": cache.meal_recommendation,
         "workout": cache.workout_recommendation,
         "cached": False
-    }
+    }, validators)
 
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from backend.core.database import get_db
+from backend.core.http_cache import bump_data_version, cache_validators, is_not_modified, not_modified_response, cached_json
 from backend.models import DietLog, User
 from backend.services.ai_service import analyze_diet_image
+from backend.services.food_index import get_lookup_metrics
 import shutil
 import os
 import uuid
@@ -48,6 +51,11 @@ async def analyze_diet(
         "analysis": analysis_result
     }
 
+@router.get("/lookup-metrics")
+async def get_food_lookup_metrics():
+    # Hit rate and latency of the local food table that short-circuits text-only entries
+    return get_lookup_metrics()
+
 @router.post("/confirm")
 async def confirm_diet_log(log_data: dict, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.id == log_data.get("user_id", 1)).first()
@@ -66,4 +74,15 @@ async def confirm_diet_log(log_data: dict, db: Session = Depends(get_db)):
     db.add(new_log)
     db.commit()
     db.refresh(new_log)
+    bump_data_version(new_log.user_id)
     return new_log
+
+@router.get("/history")
+async def get_diet_history(request: Request, user_id: int = 1, db: Session = Depends(get_db)):
+    validators = cache_validators("diet-history", user_id)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
+    logs = db.query(DietLog).filter(DietLog.user_id == user_id)\
+        .order_by(DietLog.timestamp.desc()).all()
+    return cached_json(jsonable_encoder(logs), validators)
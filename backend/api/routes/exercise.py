@@ -1,8 +1,11 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Request
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 from backend.core.database import get_db
+from backend.core.http_cache import bump_data_version, cache_validators, is_not_modified, not_modified_response, cached_json
 from backend.models import ExerciseLog, User
 from backend.services.ai_service import analyze_exercise_media
+from backend.services.video_service import is_video, sample_video_frames
 import shutil
 import os
 import uuid
@@ -17,6 +20,7 @@ async def analyze_exercise(
     db: Session = Depends(get_db)
 ):
     image_bytes = None
+    frames = None
     file_path = None
     content_type = "image/jpeg" # Default
 
@@ -26,17 +30,26 @@ async def analyze_exercise(
         filename = f"ex_{uuid.uuid4()}.{file_extension}"
         file_path = os.path.join(UPLOAD_DIR, filename)
 
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-            await file.seek(0)
-            image_bytes = await file.read()
-        
         content_type = file.content_type
+        if is_video(content_type):
+            # Stream clips straight to disk; only the sampled keyframes are held in memory
+            with open(file_path, "wb") as buffer:
+                shutil.copyfileobj(file.file, buffer)
+            frames = await sample_video_frames(file_path)
+            if not frames:
+                # Decoder unavailable or clip unreadable: fall back to sending the raw upload
+                with open(file_path, "rb") as f:
+                    image_bytes = f.read()
+        else:
+            with open(file_path, "wb") as buffer:
+                content = await file.read()
+                buffer.write(content)
+                await file.seek(0)
+                image_bytes = await file.read()
 
     try:
         # Pass text input and mime type
-        analysis_result = await analyze_exercise_media(image_bytes, content_type, text_input)
+        analysis_result = await analyze_exercise_media(image_bytes, content_type, text_input, frames)
     except Exception as e:
         return {
             "image_path": file_path,
@@ -71,9 +84,14 @@ async def confirm_exercise_log(log_data: dict, db: Session = Depends(get_db)):
     db.add(new_log)
     db.commit()
     db.refresh(new_log)
+    bump_data_version(new_log.user_id)
     return new_log
 @router.get("/history")
-async def get_exercise_history(user_id: int = 1, db: Session = Depends(get_db)):
+async def get_exercise_history(request: Request, user_id: int = 1, db: Session = Depends(get_db)):
+    validators = cache_validators("exercise-history", user_id)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+
     logs = db.query(ExerciseLog).filter(ExerciseLog.user_id == user_id)\
         .order_by(ExerciseLog.timestamp.desc()).all()
-    return logs
+    return cached_json(jsonable_encoder(logs), validators)
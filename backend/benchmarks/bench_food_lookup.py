@@ -0,0 +1,56 @@
+"""Measures hit rate and latency of the local food table over a corpus of real diet entries.
+
+Entries ending in "# model" must not be answered locally (other dishes that merely look
+like a table entry); any local hit on them is reported as a false match.
+
+Run from repo root: python -m backend.benchmarks.bench_food_lookup
+"""
+import time
+from pathlib import Path
+
+from backend.services.food_index import lookup_meal, get_lookup_metrics
+
+CORPUS_PATH = Path(__file__).parent / "diet_entries.txt"
+ROUNDS = 200
+
+
+def main():
+    entries = []
+    expect_model = set()
+    for line in CORPUS_PATH.read_text(encoding="utf-8").splitlines():
+        entry, _, marker = line.partition("#")
+        entry = entry.strip()
+        if not entry:
+            continue
+        entries.append(entry)
+        if marker.strip() == "model":
+            expect_model.add(entry)
+
+    # First pass: show what each entry resolves to
+    false_matches = []
+    for entry in entries:
+        result = lookup_meal(entry)
+        matched = ", ".join(f"{item['name']} {item['kcal']}kcal" for item in result["items"]) if result else "-> model"
+        if result and entry in expect_model:
+            false_matches.append(entry)
+            matched += "  (FALSE MATCH)"
+        print(f"{entry:<24} {matched}")
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for entry in entries:
+            lookup_meal(entry)
+    elapsed = time.perf_counter() - start
+
+    metrics = get_lookup_metrics()
+    print()
+    print(f"entries: {len(entries)}, lookups: {metrics['lookups']}")
+    print(f"hit rate: {metrics['hit_rate']:.1%} (misses {metrics['misses']}, ambiguous {metrics['ambiguous']})")
+    print(f"latency p50 {metrics['latency_us_p50']} us, p95 {metrics['latency_us_p95']} us, max {metrics['latency_us_max']} us")
+    print(f"throughput: {ROUNDS * len(entries) / elapsed:,.0f} lookups/s")
+    print(f"false matches: {len(false_matches)} of {len(expect_model)} entries that must go to the model"
+          + (f" ({', '.join(false_matches)})" if false_matches else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compares upstream payload size and preprocessing latency for raw vs sampled video uploads.
+
+Run from repo root: python -m backend.benchmarks.bench_video_frames
+"""
+import base64
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from backend.services.video_service import extract_keyframes, VIDEO_FRAME_COUNT
+
+FPS = 30
+RESOLUTION = (1280, 720)
+CLIP_SECONDS = [5, 15, 30, 60]
+
+
+def make_clip(path: str, seconds: int):
+    """Writes a synthetic clip: a moving block whose color changes every couple of seconds."""
+    width, height = RESOLUTION
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), FPS, RESOLUTION)
+    rng = np.random.default_rng(seconds)
+    color = rng.integers(0, 255, 3).tolist()
+    for i in range(seconds * FPS):
+        if i % (FPS * 2) == 0:
+            color = rng.integers(0, 255, 3).tolist()
+        frame = np.full((height, width, 3), 40, dtype=np.uint8)
+        x = (i * 8) % (width - 200)
+        cv2.rectangle(frame, (x, 200), (x + 200, 500), color, -1)
+        writer.write(frame)
+    writer.release()
+
+
+def data_url_size(chunks):
+    return sum(len(base64.b64encode(chunk)) for chunk in chunks)
+
+
+def main():
+    print(f"{'clip':>6} {'raw payload':>14} {'mode':>8} {'frames':>7} {'payload':>12} {'latency':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for seconds in CLIP_SECONDS:
+            path = os.path.join(tmp, f"clip_{seconds}s.mp4")
+            make_clip(path, seconds)
+            with open(path, "rb") as f:
+                raw_size = data_url_size([f.read()])
+            for mode in ("uniform", "scene"):
+                start = time.perf_counter()
+                frames = extract_keyframes(path, VIDEO_FRAME_COUNT, mode=mode)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"{seconds:>5}s {raw_size / 1024:>11.1f} KB {mode:>8} {len(frames):>7} "
+                    f"{data_url_size(frames) / 1024:>9.1f} KB {elapsed * 1000:>7.1f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import math
+import time
+import uuid
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+# Versions live in process memory. A restart must invalidate every tag handed out before it,
+# hence the boot id. This assumes a single server process (as in the README's uvicorn command):
+# under `uvicorn --workers N` a confirm handled by one worker does not change another worker's
+# tags, so clients revalidating there would get stale 304s.
+BOOT_ID = uuid.uuid4().hex[:8]
+_BOOT_TIME = math.floor(time.time())
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, used as the app's default response class."""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+# user_id -> (data version, unix time of last change); bumped by the confirm routes
+_versions = {}
+
+# Clients may keep the response but must revalidate it on every use
+CACHE_CONTROL = "private, no-cache"
+
+
+def bump_data_version(user_id: int):
+    version, _ = _versions.get(user_id, (0, _BOOT_TIME))
+    _versions[user_id] = (version + 1, time.time())
+
+
+def cache_validators(scope: str, user_id: int, day=None):
+    """Builds (etag, last change time) for a per-user read without touching the database.
+
+    Pass `day` for responses that also change when the date rolls over.
+    """
+    version, modified_at = _versions.get(user_id, (0, _BOOT_TIME))
+    etag = f'W/"{BOOT_ID}-{scope}-{user_id}-{version}'
+    if day is not None:
+        etag += f"-{day.isoformat()}"
+        day_start = int(datetime(day.year, day.month, day.day, tzinfo=timezone.utc).timestamp())
+        modified_at = max(modified_at, day_start)
+    return etag + '"', modified_at
+
+
+def is_not_modified(request: Request, validators) -> bool:
+    etag, modified_at = validators
+    if_none_match = request.headers.get("if-none-match")
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or etag[2:] in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            # Compare the exact change time, not the whole second sent as Last-Modified: a change
+            # in the same second as the client's date may have landed after its copy was made
+            return modified_at <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _headers(validators):
+    etag, modified_at = validators
+    # Rounded down so the date is never later than the server's own clock (RFC 9110 8.8.2.1)
+    last_modified = formatdate(math.floor(modified_at), usegmt=True)
+    return {"ETag": etag, "Last-Modified": last_modified, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified_response(validators) -> Response:
+    return Response(status_code=304, headers=_headers(validators))
+
+
+def cached_json(content, validators) -> ORJSONResponse:
+    return ORJSONResponse(content, headers=_headers(validators))
@@ -0,0 +1,143 @@
+import os
+import re
+import time
+import asyncio
+import random
+import threading
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+
+try:
+    from pyinstrument import Profiler
+    from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+except ImportError:
+    # Profiling is opt-in; without pyinstrument only SQL statistics are collected
+    Profiler = None
+
+# "off" (default), "header" (only requests sending X-Profile: 1) or "always"
+PROFILE_MODE = os.getenv("PROFILE_MODE", "off")
+# Fraction of requests profiled in "always" mode
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1.0"))
+# Only requests slower than this get a profile written to disk
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "500"))
+# "speedscope" (open at https://www.speedscope.app) or "html" (pyinstrument flame view)
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "speedscope")
+PROFILE_DIR = Path(os.getenv("PROFILE_DIR", Path(__file__).parent.parent / "profiles"))
+PROFILE_INTERVAL = 0.001
+PROFILE_HEADER = "x-profile"
+# The same statement run this many times in one request is reported as a likely N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+# Per-request SQL statistics; the dict is shared with the endpoint task via context copy
+_sql_stats = ContextVar("sql_stats", default=None)
+
+
+def _new_sql_stats():
+    return {"count": 0, "total_ms": 0.0, "blocking_ms": 0.0, "statements": Counter()}
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats = _sql_stats.get()
+    if stats is None:
+        return
+    stats["count"] += 1
+    stats["total_ms"] += elapsed_ms
+    stats["statements"][statement] += 1
+    # Sync SQLAlchemy called straight from an async route stalls every other request
+    if _on_event_loop():
+        stats["blocking_ms"] += elapsed_ms
+
+
+def _should_profile(request: Request) -> bool:
+    if Profiler is None:
+        return False
+    if PROFILE_MODE == "always":
+        return random.random() < PROFILE_SAMPLE_RATE
+    if PROFILE_MODE == "header":
+        return request.headers.get(PROFILE_HEADER) == "1"
+    return False
+
+
+def _write_profile(profiler, request: Request, elapsed_ms: float):
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_") or "root"
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    if PROFILE_FORMAT == "html":
+        renderer, suffix = HTMLRenderer(), "html"
+    else:
+        renderer, suffix = SpeedscopeRenderer(), "speedscope.json"
+    path = PROFILE_DIR / f"{stamp}-{request.method}-{slug}-{int(elapsed_ms)}ms.{suffix}"
+    path.write_text(profiler.output(renderer), encoding="utf-8")
+    return path
+
+
+def _report(request: Request, elapsed_ms: float, stats, profile_path):
+    print(
+        f"[PROFILE] {request.method} {request.url.path} {elapsed_ms:.1f}ms, "
+        f"{stats['count']} queries {stats['total_ms']:.1f}ms "
+        f"({stats['blocking_ms']:.1f}ms blocking the event loop)"
+        + (f", profile: {profile_path}" if profile_path else "")
+    )
+    for statement, count in stats["statements"].most_common():
+        if count < N_PLUS_ONE_THRESHOLD:
+            break
+        print(f"[PROFILE]   possible N+1: {count}x {' '.join(statement.split())[:120]}")
+
+
+def install_profiling(app: FastAPI, engine):
+    """Adds SQL timing and opt-in per-request sampling profiles. Does nothing when PROFILE_MODE is off."""
+    if PROFILE_MODE == "off":
+        return
+    if Profiler is None:
+        print("[WARN] pyinstrument is not installed; only SQL statistics will be collected")
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    # Profiles from concurrent requests would interleave samples, so take one at a time
+    profiler_lock = threading.Lock()
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        stats = _new_sql_stats()
+        token = _sql_stats.set(stats)
+        profiler = None
+        if _should_profile(request) and profiler_lock.acquire(blocking=False):
+            profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+            profiler.start()
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if profiler is not None:
+                profiler.stop()
+                profiler_lock.release()
+            _sql_stats.reset(token)
+
+        response.headers["Server-Timing"] = (
+            f'db;dur={stats["total_ms"]:.1f};desc="{stats["count"]} queries", total;dur={elapsed_ms:.1f}'
+        )
+        if elapsed_ms >= PROFILE_SLOW_MS:
+            profile_path = None
+            if profiler is not None:
+                profile_path = await asyncio.to_thread(_write_profile, profiler, request, elapsed_ms)
+            _report(request, elapsed_ms, stats, profile_path)
+        return response
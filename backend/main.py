@@ -9,23 +9,44 @@ if env_path.exists():
 else:
     load_dotenv()
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+try:
+    # Serves br to clients that accept it and falls back to gzip otherwise
+    from brotli_asgi import BrotliMiddleware as CompressionMiddleware
+except ImportError:
+    from fastapi.middleware.gzip import GZipMiddleware as CompressionMiddleware
 try:
     # Run from repo root: uvicorn backend.main:app
     from backend.core.database import engine, Base
+    from backend.core.http_cache import ORJSONResponse
+    from backend.core.profiling import install_profiling
+    from backend.services.video_service import shutdown_pool
+    from backend.services.thumbnail_service import close_client
     from backend import models
     from backend.api.routes import diet
 except ModuleNotFoundError:
     # Run from backend/ directory: uvicorn main:app
     from core.database import engine, Base
+    from core.http_cache import ORJSONResponse
+    from core.profiling import install_profiling
+    from services.video_service import shutdown_pool
+    from services.thumbnail_service import close_client
     import models
     from api.routes import diet
 
 # Create tables
 Base.metadata.create_all(bind=engine)
 
-app = FastAPI(title="VibeHealth API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Release the video decoder pool and the shared thumbnail HTTP client
+    shutdown_pool()
+    await close_client()
+
+app = FastAPI(title="VibeHealth API", version="0.1.0", default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # CORS
 origins = [
@@ -41,13 +62,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=500)
+# Opt-in via PROFILE_MODE=header|always; see backend/core/profiling.py
+install_profiling(app, engine)
 
 app.include_router(diet.router, prefix="/api/v1/diet", tags=["diet"])
 from backend.api.routes import dashboard
 app.include_router(dashboard.router, prefix="/api/v1/dashboard", tags=["dashboard"])
 from backend.api.routes import exercise
 app.include_router(exercise.router, prefix="/api/v1/exercise", tags=["exercise"])
-
 @app.get("/")
 def read_root():
     return {"message": "Welcome to VibeHealth API"}
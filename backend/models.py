@@ -2,7 +2,7 @@ from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text,
 from sqlalchemy.orm import relationship
 try:
     # Run from repo root: uvicorn backend.main:app
-from backend.core.database import Base
+    from backend.core.database import Base
 except ModuleNotFoundError:
     # Run from backend/ directory: uvicorn main:app
     from core.database import Base
@@ -70,3 +70,12 @@ class DailyReport(Base):
     kakao_sent = Column(Boolean, default=False)
 
     user = relationship("User", back_populates="daily_reports")
+
+class RecommendationCache(Base):
+    __tablename__ = "recommendation_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    meal_recommendation = Column(String, nullable=True)
+    workout_recommendation = Column(String, nullable=True)
+    generated_at = Column(DateTime, default=datetime.utcnow)
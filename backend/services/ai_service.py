@@ -4,6 +4,12 @@ import base64
 import json
 import re
 from fastapi import HTTPException
+try:
+    from backend.services.thumbnail_service import get_thumbnail
+    from backend.services.food_index import lookup_meal
+except ModuleNotFoundError:
+    from services.thumbnail_service import get_thumbnail
+    from services.food_index import lookup_meal
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
 OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
@@ -44,19 +50,16 @@ async def get_youtube_thumbnail(text_input: str):
         return None
     
     video_id = match.group(6)
-    thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-    
-    # Fallback to hqdefault if maxres doesn't exist (handled by checking response size or status, but simplified here)
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(thumbnail_url)
-        if resp.status_code == 200:
-            return resp.content
-        
-        # Fallback
-        resp = await client.get(f"https://img.youtube.com/vi/{video_id}/0.jpg")
-        return resp.content if resp.status_code == 200 else None
+    # Cached on disk and in memory; candidate resolutions are fetched concurrently
+    return await get_thumbnail(video_id)
 
 async def analyze_diet_image(image_bytes: bytes = None, mime_type: str = "image/jpeg", text_input: str = ""):
+    # Text-only entries for known foods are answered from the local table without a model call
+    if not image_bytes and text_input:
+        local_result = lookup_meal(text_input)
+        if local_result:
+            return local_result
+
     if not OPENROUTER_API_KEY:
         return {
             "items": [{"name": "Mock Food (No Key)", "kcal": 0, "carbs": 0, "protein": 0, "fat": 0}], 
@@ -120,7 +123,7 @@ async def analyze_diet_image(image_bytes: bytes = None, mime_type: str = "image/
             print(f"Error calling OpenRouter Diet: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
-async def analyze_exercise_media(image_bytes: bytes = None, mime_type: str = "image/jpeg", text_input: str = ""):
+async def analyze_exercise_media(image_bytes: bytes = None, mime_type: str = "image/jpeg", text_input: str = "", frames: list = None):
     if not OPENROUTER_API_KEY:
         return {
             "exercise_type": "Mock Squat (No Key)",
@@ -129,21 +132,25 @@ async def analyze_exercise_media(image_bytes: bytes = None, mime_type: str = "im
         }
 
     # 1. Handle YouTube URL in text
-    if not image_bytes and text_input:
+    if not image_bytes and not frames and text_input:
         yt_thumbnail = await get_youtube_thumbnail(text_input)
         if yt_thumbnail:
             image_bytes = yt_thumbnail
             mime_type = "image/jpeg"
             text_input += " (Analyzed via YouTube Thumbnail)"
 
-    # 2. Prepare Data URL
-    data_url = None
-    if image_bytes:
+    # 2. Prepare Data URLs (sampled video keyframes take precedence over the raw upload)
+    data_urls = []
+    if frames:
+        for frame in frames:
+            base64_frame = base64.b64encode(frame).decode("utf-8")
+            data_urls.append(f"data:image/jpeg;base64,{base64_frame}")
+    elif image_bytes:
         base64_data = base64.b64encode(image_bytes).decode("utf-8")
-        data_url = f"data:{mime_type};base64,{base64_data}"
+        data_urls.append(f"data:{mime_type};base64,{base64_data}")
 
     # 3. Validation: Need at least one source
-    if not data_url and not text_input:
+    if not data_urls and not text_input:
          raise HTTPException(status_code=400, detail="Provide image, video, or text description.")
 
     headers = {
@@ -159,6 +166,7 @@ async def analyze_exercise_media(image_bytes: bytes = None, mime_type: str = "im
     {user_text_prompt}
     1. Identify the exercise type.
     2. Analyze the form/posture (if visual provided).
+       Multiple images are keyframes of one video in playback order.
     3. Recommend a workout plan.
     
     Return ONLY a valid JSON object:
@@ -170,7 +178,7 @@ async def analyze_exercise_media(image_bytes: bytes = None, mime_type: str = "im
     """
 
     messages = [{"role": "user", "content": []}]
-    if data_url:
+    for data_url in data_urls:
         messages[0]["content"].append({"type": "image_url", "image_url": {"url": data_url}})
     messages[0]["content"].append({"type": "text", "text": prompt})
 
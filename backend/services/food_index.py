@@ -0,0 +1,228 @@
+import json
+import re
+import time
+import unicodedata
+from collections import Counter, deque
+from pathlib import Path
+
+FOODS_PATH = Path(__file__).parent.parent / "data" / "foods.json"
+# Minimum Dice similarity (over jamo trigrams) for a fuzzy match to count
+MATCH_THRESHOLD = 0.75
+# The best food must beat the runner-up by this much, otherwise the entry is ambiguous
+AMBIGUITY_MARGIN = 0.1
+NGRAM = 3
+# Fuzzy hits on keys shorter than this must have the same number of syllables, so a
+# different dish that is a prefix of an entry ('김치볶음' vs '김치볶음밥') is not a match.
+# Longer keys may differ by one syllable.
+SHORT_KEY_SYLLABLES = 6
+
+NUMBER_WORDS = {"반": 0.5, "한": 1, "두": 2, "세": 3, "네": 4, "다섯": 5}
+# Units that mean "one portion" whatever the food's own serving unit is
+PORTION_UNITS = {"인분", "그릇", "공기", "접시"}
+QUANTITY_RE = re.compile(
+    r"(\d+(?:\.\d+)?|다섯|반|한|두|세|네)\s*"
+    r"(인분|그릇|공기|접시|개|조각|줄|컵|잔|마리|피스|토막|모|g|그램)?(?![가-힣])"
+)
+HANGUL_RE = re.compile(r"[가-힣]")
+SEPARATOR_RE = re.compile(r"\s*(?:[,+/&·\n]|그리고|하고\s|랑\s)\s*")
+
+_foods = None
+_exact = {}  # normalized name/alias -> food index
+_postings = {}  # jamo trigram -> set of key ids
+_keys = []  # key id -> (food index, trigram count, key length)
+
+_metrics = {"lookups": 0, "hits": 0, "misses": 0, "ambiguous": 0}
+_STATUS_COUNTERS = {"hit": "hits", "miss": "misses", "ambiguous": "ambiguous"}
+_latencies_us = deque(maxlen=1000)
+
+
+def _decompose(text: str) -> str:
+    """Splits precomposed Hangul syllables into jamo so one wrong vowel only breaks a few n-grams."""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(chr(0x1100 + code // 588))
+            out.append(chr(0x1161 + (code % 588) // 28))
+            if code % 28:
+                out.append(chr(0x11A7 + code % 28))
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFC", text).lower()
+    return re.sub(r"[^0-9a-z가-힣]", "", text)
+
+
+def _ngrams(key: str):
+    padded = "^" * (NGRAM - 1) + _decompose(key) + "$"
+    return {padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1)}
+
+
+def _parse_serving(serving: str):
+    match = QUANTITY_RE.fullmatch(serving.strip())
+    if not match:
+        return 1, serving
+    qty, unit = match.groups()
+    return float(NUMBER_WORDS.get(qty, qty)), unit or ""
+
+
+def _load():
+    global _foods
+    if _foods is not None:
+        return
+    with open(FOODS_PATH, encoding="utf-8") as f:
+        foods = json.load(f)
+    for idx, food in enumerate(foods):
+        food["serving_qty"], food["serving_unit"] = _parse_serving(food["serving"])
+        for name in [food["name"]] + food["aliases"]:
+            key = normalize(name)
+            _exact.setdefault(key, idx)
+            grams = _ngrams(key)
+            key_id = len(_keys)
+            _keys.append((idx, len(grams), len(key)))
+            for gram in grams:
+                _postings.setdefault(gram, set()).add(key_id)
+    _foods = foods
+
+
+def _split_quantity(segment: str):
+    """Pulls a portion like '1인분', '두 개' or '200g' out of a segment."""
+    for match in QUANTITY_RE.finditer(segment):
+        qty, unit = match.groups()
+        rest = segment[:match.start()] + " " + segment[match.end():]
+        if unit is None and not qty[0].isdigit():
+            # The lookahead already keeps '한우' or '세트' whole; a number word glued to the end
+            # of a word ('라면반') is left for the model too
+            if match.start() > 0 and HANGUL_RE.match(segment[match.start() - 1]):
+                continue
+            # A standalone '반' or '한' counts portions, e.g. '김치찌개 반' is half a serving
+            return rest, float(NUMBER_WORDS[qty]), "인분"
+        return rest, float(NUMBER_WORDS.get(qty, qty)), unit or ""
+    return segment, None, ""
+
+
+def _multiplier(food, qty, unit):
+    if qty is None:
+        return 1.0
+    if unit in ("g", "그램"):
+        return qty / food["serving_g"] if food["serving_g"] else None
+    if unit == food["serving_unit"] or not unit:
+        return qty / food["serving_qty"]
+    if unit in PORTION_UNITS:
+        # '치킨 반' against a '반마리' serving could mean half a chicken or half a serving
+        if qty < 1 and food["serving_qty"] != 1:
+            return None
+        return qty
+    # e.g. '치킨 2조각' against a '반마리' serving: let the model estimate it
+    return None
+
+
+def _strip_particle(key: str) -> str:
+    # '이랑' follows a final consonant ('미역국이랑 밥'); the split on '랑' leaves the '이' behind
+    if key not in _exact and key.endswith("이") and key[:-1] in _exact:
+        return key[:-1]
+    return key
+
+
+def _best_match(key: str):
+    """Returns (food index or None, status) where status is 'hit', 'miss' or 'ambiguous'."""
+    if key in _exact:
+        return _exact[key], "hit"
+    grams = _ngrams(key)
+    shared = Counter()
+    for gram in grams:
+        shared.update(_postings.get(gram, ()))
+    scores = {}
+    for key_id, count in shared.items():
+        food_idx, size, length = _keys[key_id]
+        max_gap = 0 if min(length, len(key)) < SHORT_KEY_SYLLABLES else 1
+        if abs(length - len(key)) > max_gap:
+            continue
+        score = 2 * count / (len(grams) + size)
+        if score > scores.get(food_idx, 0):
+            scores[food_idx] = score
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    if not ranked or ranked[0][1] < MATCH_THRESHOLD:
+        return None, "miss"
+    if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < AMBIGUITY_MARGIN:
+        return None, "ambiguous"
+    return ranked[0][0], "hit"
+
+
+def _advice(total_kcal, protein, fat):
+    if total_kcal > 900:
+        return "한 끼 열량이 높은 편입니다. 다음 식사는 가볍게 드세요."
+    if total_kcal and protein * 4 / total_kcal < 0.15:
+        return "단백질이 부족한 편이에요. 계란이나 두부를 곁들여 보세요."
+    if total_kcal and fat * 9 / total_kcal > 0.4:
+        return "지방 비중이 높은 식사입니다. 채소를 함께 드시면 좋아요."
+    return "영양 균형이 무난한 식사입니다."
+
+
+def _match_entry(text_input: str):
+    segments = [s for s in SEPARATOR_RE.split(text_input.strip()) if s]
+    if not segments:
+        return None, "miss"
+    items = []
+    for segment in segments:
+        rest, qty, unit = _split_quantity(segment)
+        food_idx, status = _best_match(_strip_particle(normalize(rest)))
+        if food_idx is None:
+            return None, status
+        food = _foods[food_idx]
+        factor = _multiplier(food, qty, unit)
+        if factor is None:
+            return None, "ambiguous"
+        items.append({
+            "name": food["name"],
+            "kcal": round(food["kcal"] * factor),
+            "carbs": round(food["carbs"] * factor, 1),
+            "protein": round(food["protein"] * factor, 1),
+            "fat": round(food["fat"] * factor, 1),
+        })
+    return items, "hit"
+
+
+def lookup_meal(text_input: str):
+    """Answers a text-only diet entry from the bundled food table.
+
+    Returns an analysis dict shaped like the vision model's response, or None when any
+    part of the entry is unknown or ambiguous and the model should be asked instead.
+    """
+    _load()
+    start = time.perf_counter()
+    items, status = _match_entry(text_input)
+    _latencies_us.append((time.perf_counter() - start) * 1_000_000)
+    _metrics["lookups"] += 1
+    _metrics[_STATUS_COUNTERS[status]] += 1
+    if items is None:
+        return None
+
+    total_kcal = sum(item["kcal"] for item in items)
+    protein = sum(item["protein"] for item in items)
+    fat = sum(item["fat"] for item in items)
+    return {
+        "items": items,
+        "total_kcal": total_kcal,
+        "advice": _advice(total_kcal, protein, fat),
+        "source": "local_db",
+    }
+
+
+def get_lookup_metrics():
+    latencies = sorted(_latencies_us)
+    lookups = _metrics["lookups"]
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 1) if latencies else 0
+
+    return {
+        **_metrics,
+        "hit_rate": round(_metrics["hits"] / lookups, 3) if lookups else 0,
+        "latency_us_p50": percentile(0.5),
+        "latency_us_p95": percentile(0.95),
+        "latency_us_max": round(latencies[-1], 1) if latencies else 0,
+    }
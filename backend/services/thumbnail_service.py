@@ -0,0 +1,145 @@
+import os
+import re
+import time
+import asyncio
+from collections import OrderedDict
+from pathlib import Path
+
+import httpx
+
+THUMBNAIL_BASE_URL = os.getenv("THUMBNAIL_BASE_URL", "https://img.youtube.com/vi")
+# Candidate images, best quality first. They are requested concurrently.
+THUMBNAIL_CANDIDATES = ["maxresdefault.jpg", "hqdefault.jpg", "0.jpg"]
+THUMBNAIL_CACHE_DIR = Path(os.getenv("THUMBNAIL_CACHE_DIR", Path(__file__).parent.parent / "cache" / "thumbnails"))
+THUMBNAIL_MEMORY_ITEMS = int(os.getenv("THUMBNAIL_MEMORY_ITEMS", "128"))
+# How long a video with no thumbnail is remembered as a miss
+THUMBNAIL_NEGATIVE_TTL = float(os.getenv("THUMBNAIL_NEGATIVE_TTL", "3600"))
+THUMBNAIL_TIMEOUT = 10.0
+
+VIDEO_ID_RE = re.compile(r"^[A-Za-z0-9_-]{11}$")
+
+_memory_cache = OrderedDict()  # video_id -> bytes (LRU)
+_negative_cache = {}  # video_id -> expiry (monotonic seconds)
+_inflight = {}  # video_id -> asyncio.Task, so concurrent requests share one fetch
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=THUMBNAIL_TIMEOUT)
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def clear_cache():
+    """Drops the in-memory and negative caches (disk files are kept)."""
+    _memory_cache.clear()
+    _negative_cache.clear()
+
+
+def _remember(video_id: str, data: bytes):
+    _memory_cache[video_id] = data
+    _memory_cache.move_to_end(video_id)
+    while len(_memory_cache) > THUMBNAIL_MEMORY_ITEMS:
+        _memory_cache.popitem(last=False)
+
+
+def _disk_path(video_id: str) -> Path:
+    return THUMBNAIL_CACHE_DIR / f"{video_id}.jpg"
+
+
+def _read_disk(video_id: str):
+    path = _disk_path(video_id)
+    return path.read_bytes() if path.exists() else None
+
+
+def _write_disk(video_id: str, data: bytes):
+    THUMBNAIL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _disk_path(video_id)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(path)
+
+
+# Only these say the image does not exist; anything else (429, 5xx, ...) may succeed later
+MISSING_STATUSES = {404, 410}
+
+
+async def _fetch_candidate(client, url: str):
+    resp = await client.get(url)
+    if resp.status_code in MISSING_STATUSES:
+        raise LookupError(f"{url} returned {resp.status_code}")
+    if resp.status_code != 200 or not resp.content:
+        raise httpx.HTTPStatusError(f"{url} returned {resp.status_code}", request=resp.request, response=resp)
+    return resp.content
+
+
+async def _fetch_first_available(video_id: str):
+    """Requests all candidates at once; returns (bytes or None, whether every candidate was a real miss)."""
+    client = _get_client()
+    tasks = [
+        asyncio.create_task(_fetch_candidate(client, f"{THUMBNAIL_BASE_URL}/{video_id}/{name}"))
+        for name in THUMBNAIL_CANDIDATES
+    ]
+    definitive_miss = True
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            try:
+                return await next_done, False
+            except LookupError as e:
+                print(f"[DEBUG] Thumbnail candidate missing: {e}")
+            except httpx.HTTPError as e:
+                # Network trouble or a server error says nothing about the video, so don't negative-cache it
+                print(f"[DEBUG] Thumbnail candidate failed: {e}")
+                definitive_miss = False
+        return None, definitive_miss
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _load(video_id: str):
+    data = await asyncio.to_thread(_read_disk, video_id)
+    if data is None:
+        data, definitive_miss = await _fetch_first_available(video_id)
+        if data is None:
+            if definitive_miss:
+                _negative_cache[video_id] = time.monotonic() + THUMBNAIL_NEGATIVE_TTL
+            return None
+        try:
+            await asyncio.to_thread(_write_disk, video_id, data)
+        except OSError as e:
+            print(f"[WARN] Could not write thumbnail cache for {video_id}: {e}")
+    _remember(video_id, data)
+    return data
+
+
+async def get_thumbnail(video_id: str):
+    """Returns thumbnail bytes for a YouTube video id, or None if no candidate image exists."""
+    if not VIDEO_ID_RE.match(video_id):
+        return None
+
+    data = _memory_cache.get(video_id)
+    if data is not None:
+        _memory_cache.move_to_end(video_id)
+        return data
+
+    expiry = _negative_cache.get(video_id)
+    if expiry is not None:
+        if expiry > time.monotonic():
+            return None
+        del _negative_cache[video_id]
+
+    task = _inflight.get(video_id)
+    if task is None:
+        task = asyncio.create_task(_load(video_id))
+        _inflight[video_id] = task
+        task.add_done_callback(lambda _: _inflight.pop(video_id, None))
+    return await asyncio.shield(task)
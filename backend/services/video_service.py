@@ -0,0 +1,150 @@
+import os
+import asyncio
+import heapq
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import cv2
+except ImportError:
+    # opencv-python-headless is required for local frame sampling.
+    # Without it, exercise analysis falls back to sending the raw upload.
+    cv2 = None
+
+# Number of keyframes sent to the vision model per clip
+VIDEO_FRAME_COUNT = int(os.getenv("VIDEO_FRAME_COUNT", "6"))
+# Longest side (px) of each sampled frame after downsizing
+VIDEO_FRAME_MAX_SIDE = int(os.getenv("VIDEO_FRAME_MAX_SIDE", "512"))
+VIDEO_JPEG_QUALITY = int(os.getenv("VIDEO_JPEG_QUALITY", "70"))
+# "scene" picks the frames with the largest visual change, "uniform" spaces them evenly
+VIDEO_SAMPLING_MODE = os.getenv("VIDEO_SAMPLING_MODE", "scene")
+VIDEO_DECODE_WORKERS = int(os.getenv("VIDEO_DECODE_WORKERS", "2"))
+# Recycle decoder processes so a leaky codec cannot grow memory forever
+VIDEO_WORKER_MAX_TASKS = 50
+# In scene mode, this many candidates per requested frame are decoded and scored
+SCENE_OVERSAMPLE = 4
+
+_pool = None
+
+
+def is_video(mime_type: str) -> bool:
+    return bool(mime_type) and mime_type.startswith("video/")
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=VIDEO_DECODE_WORKERS,
+            max_tasks_per_child=VIDEO_WORKER_MAX_TASKS,
+        )
+    return _pool
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _downsize(frame, max_side: int):
+    height, width = frame.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return frame
+    size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def _encode_jpeg(frame, quality: int) -> bytes:
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes() if ok else b""
+
+
+def _histogram(frame):
+    gray = cv2.cvtColor(cv2.resize(frame, (64, 64)), cv2.COLOR_BGR2GRAY)
+    hist = cv2.calcHist([gray], [0], None, [32], [0, 256])
+    return cv2.normalize(hist, hist).flatten()
+
+
+def _frame_indices(cap, count: int):
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    if total <= 0:
+        return []
+    count = min(count, total)
+    # Take the middle of each equal segment so the first/last black frames are skipped
+    return [int((i + 0.5) * total / count) for i in range(count)]
+
+
+def _read_at(cap, idx: int):
+    cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+    ok, frame = cap.read()
+    return frame if ok else None
+
+
+def _uniform_frames(cap, count: int, max_side: int):
+    frames = []
+    for idx in _frame_indices(cap, count):
+        frame = _read_at(cap, idx)
+        if frame is not None:
+            frames.append(_downsize(frame, max_side))
+    return frames
+
+
+def _scene_frames(cap, count: int, max_side: int):
+    # Score a fixed number of evenly spaced candidates, so cost does not grow with clip length.
+    # Min-heap of (change score, frame index, downsized frame); at most `count` frames are held.
+    heap = []
+    prev_hist = None
+    for idx in _frame_indices(cap, count * SCENE_OVERSAMPLE):
+        frame = _read_at(cap, idx)
+        if frame is None:
+            continue
+        hist = _histogram(frame)
+        if prev_hist is None:
+            # Always keep the opening frame as the reference pose
+            score = float("inf")
+        else:
+            score = cv2.compareHist(prev_hist, hist, cv2.HISTCMP_BHATTACHARYYA)
+        prev_hist = hist
+        if len(heap) < count:
+            heapq.heappush(heap, (score, idx, _downsize(frame, max_side)))
+        elif (score, idx) > heap[0][:2]:
+            heapq.heapreplace(heap, (score, idx, _downsize(frame, max_side)))
+    return [frame for _, _, frame in sorted(heap, key=lambda item: item[1])]
+
+
+def extract_keyframes(video_path: str, count: int = VIDEO_FRAME_COUNT,
+                      max_side: int = VIDEO_FRAME_MAX_SIDE, mode: str = VIDEO_SAMPLING_MODE,
+                      quality: int = VIDEO_JPEG_QUALITY):
+    """Decodes a clip from disk and returns up to `count` downsized JPEG keyframes in playback order."""
+    if cv2 is None:
+        return []
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return []
+        if mode == "uniform":
+            frames = _uniform_frames(cap, count, max_side)
+        else:
+            frames = _scene_frames(cap, count, max_side)
+    finally:
+        cap.release()
+    encoded = [_encode_jpeg(frame, quality) for frame in frames]
+    return [data for data in encoded if data]
+
+
+async def sample_video_frames(video_path: str, count: int = VIDEO_FRAME_COUNT,
+                              mode: str = VIDEO_SAMPLING_MODE):
+    """Runs keyframe extraction in the decoder process pool so the event loop stays free."""
+    if cv2 is None:
+        print("[WARN] opencv is not installed; skipping video frame sampling")
+        return []
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_pool(), extract_keyframes, video_path, count, VIDEO_FRAME_MAX_SIDE, mode
+        )
+    except Exception as e:
+        print(f"[ERROR] Video frame sampling failed: {e}")
+        return []
@@ -0,0 +1,92 @@
+from email.utils import formatdate
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+import pytest
+
+from backend.core import http_cache
+
+USER_ID = 1
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake wall clock for the data-version timestamps; set clock.now to move it."""
+
+    class Clock:
+        now = 1_700_000_000.0
+
+    monkeypatch.setattr(http_cache, "_versions", {})
+    monkeypatch.setattr(http_cache.time, "time", lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture
+def client():
+    # Same shape as the history routes: validators first, data only on a miss
+    app = FastAPI(default_response_class=http_cache.ORJSONResponse)
+    reads = []
+
+    @app.get("/history")
+    async def history(request: Request):
+        validators = http_cache.cache_validators("history", USER_ID)
+        if http_cache.is_not_modified(request, validators):
+            return http_cache.not_modified_response(validators)
+        reads.append(1)
+        return http_cache.cached_json({"reads": len(reads)}, validators)
+
+    @app.post("/confirm")
+    async def confirm():
+        http_cache.bump_data_version(USER_ID)
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_etag_match_returns_304(clock, client):
+    first = client.get("/history")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    again = client.get("/history", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.headers["etag"] == etag
+
+    client.post("/confirm")
+    changed = client.get("/history", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_confirm_in_same_second_defeats_if_modified_since(clock, client):
+    clock.now = 1_700_000_100.2
+    client.post("/confirm")
+    first = client.get("/history")
+    last_modified = first.headers["last-modified"]
+
+    # Another confirm later in the same second: Last-Modified would be identical
+    clock.now = 1_700_000_100.7
+    client.post("/confirm")
+    after = client.get("/history", headers={"If-Modified-Since": last_modified})
+    assert after.status_code == 200
+    assert after.headers["last-modified"] == last_modified
+    assert after.json()["reads"] == 2
+
+
+def test_if_modified_since_after_change_returns_304(clock, client):
+    clock.now = 1_700_000_100.2
+    client.post("/confirm")
+    clock.now = 1_700_000_105.0
+    client.get("/history")
+
+    # A client that dates its copy by the response time, seconds after the change
+    later = client.get("/history", headers={"If-Modified-Since": formatdate(clock.now, usegmt=True)})
+    assert later.status_code == 304
+
+
+def test_last_modified_never_ahead_of_the_clock(clock, client):
+    clock.now = 1_700_000_100.9
+    for _ in range(5):
+        client.post("/confirm")
+    response = client.get("/history")
+    assert response.headers["last-modified"] == formatdate(1_700_000_100, usegmt=True)
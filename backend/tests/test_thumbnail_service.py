@@ -0,0 +1,127 @@
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from backend.services import thumbnail_service
+
+VIDEO_ID = "abcdefghijk"
+
+
+class StandInServer:
+    """Local replacement for img.youtube.com: path -> (status, body, delay seconds)."""
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.hits.append(self.path)
+                status, body, delay = server.routes.get(self.path, (404, b"", 0))
+                time.sleep(delay)
+                self.send_response(status)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}/vi"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def route(self, name, status, body=b"", delay=0):
+        self.routes[f"/vi/{VIDEO_ID}/{name}"] = (status, body, delay)
+
+    def hits_for(self, video_id):
+        return [path for path in self.hits if f"/{video_id}/" in path]
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    stand_in = StandInServer()
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_BASE_URL", stand_in.base_url)
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_CACHE_DIR", tmp_path / "thumbnails")
+    thumbnail_service.clear_cache()
+    yield stand_in
+    thumbnail_service.clear_cache()
+    stand_in.httpd.shutdown()
+    stand_in.httpd.server_close()
+
+
+def run(coro):
+    async def wrapper():
+        try:
+            return await coro
+        finally:
+            # The shared client is bound to this event loop
+            await thumbnail_service.close_client()
+
+    return asyncio.run(wrapper())
+
+
+def test_first_good_candidate_wins(server):
+    server.route("maxresdefault.jpg", 404)
+    server.route("hqdefault.jpg", 200, b"HQ")
+    server.route("0.jpg", 200, b"ZERO", delay=0.3)
+
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) == b"HQ"
+
+
+def test_disk_hit_after_clear_cache(server):
+    server.route("hqdefault.jpg", 200, b"HQ")
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) == b"HQ"
+    fetches = len(server.hits)
+
+    thumbnail_service.clear_cache()
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) == b"HQ"
+    assert len(server.hits) == fetches
+    assert (thumbnail_service.THUMBNAIL_CACHE_DIR / f"{VIDEO_ID}.jpg").read_bytes() == b"HQ"
+
+
+def test_negative_cache_stops_refetch(server):
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) is None
+    assert len(server.hits_for(VIDEO_ID)) == len(thumbnail_service.THUMBNAIL_CANDIDATES)
+
+    server.route("hqdefault.jpg", 200, b"HQ")
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) is None
+    assert len(server.hits_for(VIDEO_ID)) == len(thumbnail_service.THUMBNAIL_CANDIDATES)
+
+
+def test_concurrent_callers_share_one_fetch(server):
+    server.route("maxresdefault.jpg", 200, b"MAX", delay=0.2)
+
+    async def many():
+        return await asyncio.gather(*[thumbnail_service.get_thumbnail(VIDEO_ID) for _ in range(5)])
+
+    assert run(many()) == [b"MAX"] * 5
+    assert len(server.hits_for(VIDEO_ID)) == len(thumbnail_service.THUMBNAIL_CANDIDATES)
+
+
+def test_network_errors_are_not_negative_cached(server, monkeypatch):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        dead_port = sock.getsockname()[1]
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_BASE_URL", f"http://127.0.0.1:{dead_port}/vi")
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) is None
+    assert VIDEO_ID not in thumbnail_service._negative_cache
+
+    monkeypatch.setattr(thumbnail_service, "THUMBNAIL_BASE_URL", server.base_url)
+    server.route("hqdefault.jpg", 200, b"HQ")
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) == b"HQ"
+
+
+def test_server_errors_are_not_negative_cached(server):
+    for name in thumbnail_service.THUMBNAIL_CANDIDATES:
+        server.route(name, 503)
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) is None
+    assert VIDEO_ID not in thumbnail_service._negative_cache
+
+    server.route("hqdefault.jpg", 200, b"HQ")
+    assert run(thumbnail_service.get_thumbnail(VIDEO_ID)) == b"HQ"